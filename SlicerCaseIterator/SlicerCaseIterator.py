@@ -14,7 +14,6 @@
 import logging
 
 import qt, ctk, slicer
-from collections import deque
 from slicer.ScriptedLoadableModule import (
     ScriptedLoadableModule,
     ScriptedLoadableModuleWidget,
@@ -74,6 +73,12 @@ class SlicerCaseIteratorWidget(ScriptedLoadableModuleWidget):
         IteratorFactory.reloadSourceFiles()
         ScriptedLoadableModuleWidget.onReload(self)
 
+    def cleanup(self):
+        """Perform the following when the application is closed."""
+        # Stop background reads of a running batch, so they do not delay the exit
+        if getattr(self, "logic", None) is not None:
+            self.logic.iterator.shutdownIO()
+
     def setup(self):
         """Perform the following when setting up the main Widget."""
         super().setup()
@@ -342,7 +347,8 @@ class SlicerCaseIteratorWidget(ScriptedLoadableModuleWidget):
             except AttributeError:
                 pass
 
-        deque(map(update, slicer.util.getNodesByClass("vtkMRMLSegmentationNode")))
+        for segNode in slicer.util.getNodesByClass("vtkMRMLSegmentationNode"):
+            update(segNode)
 
     # ------------------------------------------------------------------------------
     def onReset(self):
@@ -1,5 +1,6 @@
 import os
-from collections import OrderedDict, deque
+import json
+from collections import OrderedDict
 
 import vtk
 import qt
@@ -302,12 +303,7 @@ class CsvInferenceIteratorWidget(IteratorBase.IteratorWidgetBase):
 
 
 class CsvInferenceIteratorLogic(IteratorBase.IteratorLogicBase):
-    """_summary_
-
-    Args:
-        IteratorBase (_type_): _description_
     """Table Case Iterator Logic class."""
-    """
 
     def _createTable(self):
         """_summary_
@@ -407,8 +403,8 @@ class CsvInferenceIteratorLogic(IteratorBase.IteratorLogicBase):
                     self.logger.info("Deleting casedata for {}".format(caseIdx))
                     im, gt_ma, pred_ma = caseData
                     slicer.mrmlScene.RemoveNode(im)
-                    deque(map(slicer.mrmlScene.RemoveNode, gt_ma))
-                    deque(map(slicer.mrmlScene.RemoveNode, pred_ma))
+                    for node in gt_ma + pred_ma:
+                        slicer.mrmlScene.RemoveNode(node)
                     self.parameterNode.UnsetParameter("CaseData_{}".format(caseIdx))
                     if caseIdx in list(self._tablesCache.keys()):
                         slicer.mrmlScene.RemoveNode(self._tablesCache[caseIdx])
@@ -540,11 +536,13 @@ class CsvInferenceIteratorLogic(IteratorBase.IteratorLogicBase):
 
             self.parameterNode.SetParameter(
                 "CaseData_{}".format(case_idx),
-                {
-                    "InputImage_ID": im_node.GetID(),
-                    "GT_Mask_IDs": [node.GetID() for node in gtMaskNodes],
-                    "PRED_Mask_IDs": [node.GetID() for node in predMaskNodes],
-                }.__str__(),
+                json.dumps(
+                    {
+                        "InputImage_ID": im_node.GetID(),
+                        "GT_Mask_IDs": [node.GetID() for node in gtMaskNodes],
+                        "PRED_Mask_IDs": [node.GetID() for node in predMaskNodes],
+                    }
+                ),
             )
 
         self.currentIdx = case_idx
@@ -561,8 +559,8 @@ class CsvInferenceIteratorLogic(IteratorBase.IteratorLogicBase):
 
             if not self.cacheCases:
                 slicer.mrmlScene.RemoveNode(im)
-                deque(map(slicer.mrmlScene.RemoveNode, gt_ma))
-                deque(map(slicer.mrmlScene.RemoveNode, pred_ma))
+                for node in gt_ma + pred_ma:
+                    slicer.mrmlScene.RemoveNode(node)
                 self.parameterNode.UnsetParameter("CaseData_{}".format(self.currentIdx))
                 if self._table:
                     slicer.mrmlScene.RemoveNode(self._table)
@@ -580,7 +578,7 @@ class CsvInferenceIteratorLogic(IteratorBase.IteratorLogicBase):
         caseIdx = caseIdx if caseIdx is not None else self.currentIdx
         caseData = self.parameterNode.GetParameter("CaseData_{}".format(caseIdx))
         if caseData:
-            caseData = eval(caseData)
+            caseData = self.parseCaseData(caseData)
             im_node = slicer.mrmlScene.GetNodeByID(caseData["InputImage_ID"])
             gt_mask_nodes = list(
                 map(slicer.mrmlScene.GetNodeByID, caseData["GT_Mask_IDs"])
@@ -820,15 +818,15 @@ class CsvTableEventHandler(IteratorBase.IteratorEventHandlerBase):
         Args:
             referenceVolume (Node): The reference image to view in the panes.
         """
-        sliceNodes = slicer.util.getNodes("vtkMRMLSliceNode*")
-        for name, node in sliceNodes.items():
-            node.RotateToVolumePlane(referenceVolume)
+        scene = slicer.mrmlScene
+        getNthNode = scene.GetNthNodeByClass
+        for idx in range(scene.GetNumberOfNodesByClass("vtkMRMLSliceNode")):
+            getNthNode(idx, "vtkMRMLSliceNode").RotateToVolumePlane(referenceVolume)
         # Snap to IJK to try and avoid rounding errors
         sliceLogics = slicer.app.layoutManager().mrmlSliceLogics()
-        numLogics = sliceLogics.GetNumberOfItems()
-        for n in range(numLogics):
-            l = sliceLogics.GetItemAsObject(n)
-            l.FitSliceToAll()
+        getItem = sliceLogics.GetItemAsObject
+        for n in range(sliceLogics.GetNumberOfItems()):
+            getItem(n).FitSliceToAll()
 
     def __init__(self, reader=None, tableOutputDir=None):
         super(CsvTableEventHandler, self).__init__()
@@ -866,14 +864,15 @@ class CsvTableEventHandler(IteratorBase.IteratorEventHandlerBase):
             im, gt_ma, pred_ma = caller.getCaseData()
 
             # Set the slice viewers to the correct volumes
-            for sliceWidgetName in ["Red", "Green", "Yellow"]:
+            layoutManager = slicer.app.layoutManager()
+            imID = im.GetID()
+            for sliceWidgetName in ("Red", "Green", "Yellow"):
                 logic = (
-                    slicer.app.layoutManager()
-                    .sliceWidget(sliceWidgetName)
+                    layoutManager.sliceWidget(sliceWidgetName)
                     .sliceLogic()
                     .GetSliceCompositeNode()
                 )
-                logic.SetBackgroundVolumeID(im.GetID())
+                logic.SetBackgroundVolumeID(imID)
 
             self._rotateToVolumePlanes(im)
 
@@ -978,52 +977,75 @@ class CsvTableEventHandler(IteratorBase.IteratorEventHandlerBase):
             pred_ma (_type_): _description_
             table (_type_): _description_
         """
-        for rowIdx, (gt_seg, pred_seg) in enumerate(zip(gt_ma, pred_ma)):
-            assert len(CsvInferenceIteratorLogic.getAllSegmentIDs(gt_seg)) == 1
-            assert len(CsvInferenceIteratorLogic.getAllSegmentIDs(pred_seg)) == 1
+        # A single comparison node is reused for all segment pairs of the case
+        segmentComparisonNode = None
+        try:
+            for rowIdx, (gt_seg, pred_seg) in enumerate(zip(gt_ma, pred_ma)):
+                assert len(CsvInferenceIteratorLogic.getAllSegmentIDs(gt_seg)) == 1
+                assert len(CsvInferenceIteratorLogic.getAllSegmentIDs(pred_seg)) == 1
 
-            segmentComparisonStats = self._compareSegments(gt_seg, pred_seg)
-            additionalMetrics = self._runAdditionalMetrics(gt_seg, pred_seg)
+                if segmentComparisonNode is None:
+                    segmentComparisonNode = slicer.mrmlScene.AddNewNodeByClass(
+                        "vtkMRMLSegmentComparisonNode", "Inference"
+                    )
+                segmentComparisonStats = self._compareSegments(
+                    gt_seg, pred_seg, segmentComparisonNode
+                )
+                additionalMetrics = self._runAdditionalMetrics(gt_seg, pred_seg)
 
-            rowIdx = table.AddEmptyRow()
-            table.SetCellText(
-                rowIdx, 0, "{}/{}".format(gt_seg.GetName(), pred_seg.GetName())
-            )
+                rowIdx = table.AddEmptyRow()
+                table.SetCellText(
+                    rowIdx, 0, "{}/{}".format(gt_seg.GetName(), pred_seg.GetName())
+                )
 
-            for colIdx, stats in enumerate(
-                segmentComparisonStats + additionalMetrics, start=1
-            ):
-                table.SetCellText(rowIdx, colIdx, stats)
+                for colIdx, stats in enumerate(
+                    segmentComparisonStats + additionalMetrics, start=1
+                ):
+                    table.SetCellText(rowIdx, colIdx, stats)
+        finally:
+            if segmentComparisonNode is not None:
+                slicer.mrmlScene.RemoveNode(segmentComparisonNode)
 
-    def _compareSegments(self, gt_seg_node, pred_seg_node):
+    def _compareSegments(self, gt_seg_node, pred_seg_node, segmentComparisonNode):
         """_summary_
 
         Args:
             gt_seg_node (_type_): _description_
             pred_seg_node (_type_): _description_
+            segmentComparisonNode (vtkMRMLSegmentComparisonNode): Node to compute the
+                comparison with, reused for all segment pairs of a case.
 
         Returns:
-            _type_: _description_
+            list: The comparison statistics as strings, empty strings if the
+                  comparison failed.
         """
         gt_seg_id = self.getSegmentID(gt_seg_node)
         pred_seg_id = self.getSegmentID(pred_seg_node)
 
-        segmentComparisonNode = slicer.mrmlScene.AddNewNodeByClass(
-            "vtkMRMLSegmentComparisonNode", "Inference"
-        )
         segmentComparisonNode.SetAndObserveReferenceSegmentationNode(gt_seg_node)
         segmentComparisonNode.SetReferenceSegmentID(gt_seg_id)
         segmentComparisonNode.SetAndObserveCompareSegmentationNode(pred_seg_node)
         segmentComparisonNode.SetCompareSegmentID(pred_seg_id)
         segmentComparisonLogic = slicer.modules.segmentcomparison.logic()
-        segmentComparisonLogic.ComputeHausdorffDistances(segmentComparisonNode)
-        segmentComparisonLogic.ComputeDiceStatistics(segmentComparisonNode)
+        # Both return an error message, which is empty on success. The node is reused,
+        # so on failure it still holds the results of the previous pair.
+        errors = [
+            segmentComparisonLogic.ComputeHausdorffDistances(segmentComparisonNode),
+            segmentComparisonLogic.ComputeDiceStatistics(segmentComparisonNode),
+        ]
+        errors = [error for error in errors if error]
+        if errors:
+            self.logger.warning(
+                "Failed to compare %s and %s: %s",
+                gt_seg_node.GetName(),
+                pred_seg_node.GetName(),
+                "; ".join(errors),
+            )
+            return [""] * len(self.COMPARISON_NAMES_GETTERS)
 
         stats = list()
         for getter in self.COMPARISON_NAMES_GETTERS.values():
             stats.append(str(getattr(segmentComparisonNode, getter)()))
-
-        slicer.mrmlScene.RemoveNode(segmentComparisonNode)
         return stats
 
     def getSegmentID(self, seg_node):
@@ -12,9 +12,9 @@
 # ========================================================================
 
 import os
-import ast
-from collections import deque
-import qt, ctk, slicer
+import re
+import json
+import vtk, qt, slicer
 
 from . import IteratorBase
 
@@ -26,11 +26,25 @@ from . import IteratorBase
 class CaseTableIteratorWidget(IteratorBase.IteratorWidgetBase):
     """This class governs the widget interface for Table Iterator."""
 
+    # Initial values of the GUI elements in the parameters area, also used when the
+    # parameters area has not been built yet
+    PARAMETER_DEFAULTS = {
+        "rootSelector": "path",
+        "imageSelector": "image",
+        "maskSelector": "mask",
+        "addImsSelector": "",
+        "addMasksSelector": "",
+        "chkAutoRedirect": False,
+        "chkSaveMasks": False,
+        "chkSaveNewMasks": True,
+    }
+
     def __init__(self):
         super(CaseTableIteratorWidget, self).__init__()
 
         self.tableNode = None
         self.tableStorageNode = None
+        self._parametersBuilt = False
 
     # ------------------------------------------------------------------------------
     def setup(self):
@@ -39,6 +53,8 @@ class CaseTableIteratorWidget(IteratorBase.IteratorWidgetBase):
         Returns:
             QGroupBox: A reference to the widget to display in the extension
         """
+        import ctk
+
         self.CsvInputGroupBox = qt.QGroupBox("CSV input for local files")
 
         CsvInputLayout = qt.QFormLayout(self.CsvInputGroupBox)
@@ -59,17 +75,47 @@ class CaseTableIteratorWidget(IteratorBase.IteratorWidgetBase):
         )
         CsvInputLayout.addRow(self.batchTableSelector)
 
-        self.batchTableView = slicer.qMRMLTableView()
-        CsvInputLayout.addRow(self.batchTableView)
-        self.batchTableView.show()
+        # The table view is created when a table is selected, see `onChangeTable`
+        self.batchTableView = None
+        self._tableViewPlaceholder = qt.QWidget()
+        CsvInputLayout.addRow(self._tableViewPlaceholder)
 
         #
         # Parameters Area
         #
+        # The parameters are expanded, so that settings such as saving new masks are
+        # visible. They are built once the widget is shown rather than during setup,
+        # or when the collapsible button is expanded, whichever comes first.
         self.parametersCollapsibleButton = ctk.ctkCollapsibleButton()
         self.parametersCollapsibleButton.text = "Parameters"
         CsvInputLayout.addWidget(self.parametersCollapsibleButton)
 
+        #
+        # Connect Event Handlers
+        #
+        self.batchTableSelector.connect(
+            "nodeActivated(vtkMRMLNode*)", self.onChangeTable
+        )
+        self.parametersCollapsibleButton.toggled.connect(self._ensureParameters)
+        qt.QTimer.singleShot(0, lambda: self._ensureParameters(True))
+
+        return self.CsvInputGroupBox
+
+    # ------------------------------------------------------------------------------
+    def _ensureParameters(self, checked):
+        """Build the parameters area if it is expanded and not built yet.
+
+        Args:
+            checked (bool): True if the parameters collapsible button is expanded.
+        """
+        if checked and not self._parametersBuilt:
+            self._buildParameters()
+
+    # ------------------------------------------------------------------------------
+    def _buildParameters(self):
+        """Build the GUI elements contained in the parameters collapsible button."""
+        self._parametersBuilt = True
+
         # Layout within the dummy collapsible button
         parametersFormLayout = qt.QFormLayout(self.parametersCollapsibleButton)
 
@@ -86,7 +132,7 @@ class CaseTableIteratorWidget(IteratorBase.IteratorWidgetBase):
         # Root Path
         #
         self.rootSelector = qt.QLineEdit()
-        self.rootSelector.text = "path"
+        self.rootSelector.text = self.PARAMETER_DEFAULTS["rootSelector"]
         self.rootSelector.toolTip = (
             "Location of the root directory to load from, "
             "or the column name specifying said "
@@ -98,7 +144,7 @@ class CaseTableIteratorWidget(IteratorBase.IteratorWidgetBase):
         # Image Path
         #
         self.imageSelector = qt.QLineEdit()
-        self.imageSelector.text = "image"
+        self.imageSelector.text = self.PARAMETER_DEFAULTS["imageSelector"]
         self.imageSelector.toolTip = (
             "Name of the column specifying main image files in input CSV"
         )
@@ -108,7 +154,7 @@ class CaseTableIteratorWidget(IteratorBase.IteratorWidgetBase):
         # Mask Path
         #
         self.maskSelector = qt.QLineEdit()
-        self.maskSelector.text = "mask"
+        self.maskSelector.text = self.PARAMETER_DEFAULTS["maskSelector"]
         self.maskSelector.toolTip = (
             "Name of the column specifying main mask files in input CSV"
         )
@@ -118,7 +164,7 @@ class CaseTableIteratorWidget(IteratorBase.IteratorWidgetBase):
         # Additional images
         #
         self.addImsSelector = qt.QLineEdit()
-        self.addImsSelector.text = ""
+        self.addImsSelector.text = self.PARAMETER_DEFAULTS["addImsSelector"]
         self.addImsSelector.toolTip = (
             "Comma separated names of the columns specifying "
             "additional image files in input CSV"
@@ -131,7 +177,7 @@ class CaseTableIteratorWidget(IteratorBase.IteratorWidgetBase):
         # Additional masks
         #
         self.addMasksSelector = qt.QLineEdit()
-        self.addMasksSelector.text = ""
+        self.addMasksSelector.text = self.PARAMETER_DEFAULTS["addMasksSelector"]
         self.addMasksSelector.toolTip = (
             "Comma separated names of the columns "
             "specifying additional mask files in input CSV"
@@ -143,10 +189,14 @@ class CaseTableIteratorWidget(IteratorBase.IteratorWidgetBase):
         #
         # Connect Event Handlers
         #
-        self.batchTableSelector.connect(
-            "nodeActivated(vtkMRMLNode*)", self.onChangeTable
-        )
-        self.imageSelector.connect("textEdited(QString)", self.onChangeImageColumn)
+        for selector in (
+            self.rootSelector,
+            self.imageSelector,
+            self.maskSelector,
+            self.addImsSelector,
+            self.addMasksSelector,
+        ):
+            selector.connect("textEdited(QString)", lambda _=None: self.validate())
 
         self.segmentationParametersGroupBox = qt.QGroupBox(
             "Mask interaction parameters"
@@ -161,7 +211,7 @@ class CaseTableIteratorWidget(IteratorBase.IteratorWidgetBase):
         # Auto-redirect to SegmentEditor
         #
         self.chkAutoRedirect = qt.QCheckBox()
-        self.chkAutoRedirect.checked = False
+        self.chkAutoRedirect.checked = self.PARAMETER_DEFAULTS["chkAutoRedirect"]
         self.chkAutoRedirect.toolTip = (
             'Automatically switch module to "SegmentEditor" when each case is loaded'
         )
@@ -173,7 +223,7 @@ class CaseTableIteratorWidget(IteratorBase.IteratorWidgetBase):
         # Save masks
         #
         self.chkSaveMasks = qt.QCheckBox()
-        self.chkSaveMasks.checked = False
+        self.chkSaveMasks.checked = self.PARAMETER_DEFAULTS["chkSaveMasks"]
         self.chkSaveMasks.toolTip = (
             "save all initially loaded masks when proceeding to next case"
         )
@@ -183,13 +233,28 @@ class CaseTableIteratorWidget(IteratorBase.IteratorWidgetBase):
         # Save new masks
         #
         self.chkSaveNewMasks = qt.QCheckBox()
-        self.chkSaveNewMasks.checked = True
+        self.chkSaveNewMasks.checked = self.PARAMETER_DEFAULTS["chkSaveNewMasks"]
         self.chkSaveNewMasks.toolTip = (
             "save all newly generated masks when proceeding to next case"
         )
         segmentationParametersFormLayout.addRow("Save new masks", self.chkSaveNewMasks)
 
-        return self.CsvInputGroupBox
+    # ------------------------------------------------------------------------------
+    def _getParameter(self, name):
+        """Get the value of a parameter GUI element, or its default if not built yet.
+
+        Args:
+            name (str): Attribute name of the GUI element (key of PARAMETER_DEFAULTS).
+
+        Returns:
+            str or bool: Text of a line edit or checked state of a checkbox.
+        """
+        element = getattr(self, name, None)
+        if element is None:
+            return self.PARAMETER_DEFAULTS[name]
+        if isinstance(self.PARAMETER_DEFAULTS[name], bool):
+            return element.checked
+        return element.text
 
     # ------------------------------------------------------------------------------
     def enter(self):
@@ -208,7 +273,7 @@ class CaseTableIteratorWidget(IteratorBase.IteratorWidgetBase):
         """
         return (
             self.batchTableSelector.currentNodeID != ""
-            and self.imageSelector.text != ""
+            and self._getParameter("imageSelector") != ""
         )
 
     # ------------------------------------------------------------------------------
@@ -234,9 +299,9 @@ class CaseTableIteratorWidget(IteratorBase.IteratorWidgetBase):
         self._iterator.registerEventListener(
             CsvTableEventHandler(
                 reader=reader,
-                redirect=self.chkAutoRedirect.checked,
-                saveNew=self.chkSaveNewMasks.checked,
-                saveLoaded=self.chkSaveMasks.checked,
+                redirect=self._getParameter("chkAutoRedirect"),
+                saveNew=self._getParameter("chkSaveNewMasks"),
+                saveLoaded=self._getParameter("chkSaveMasks"),
             )
         )
         return self._iterator
@@ -246,6 +311,7 @@ class CaseTableIteratorWidget(IteratorBase.IteratorWidgetBase):
         """Clean up files and settings of the current batch."""
         if self._iterator:
             self._iterator.closeCase()
+            self._iterator.shutdownIO()
         self.tableNode = None
         self.tableStorageNode = None
         self._iterator = None
@@ -253,12 +319,17 @@ class CaseTableIteratorWidget(IteratorBase.IteratorWidgetBase):
     # ------------------------------------------------------------------------------
     def onChangeTable(self):
         """Execute on table selection from the batchTableSelector qMRMLNodeComboBox."""
-        self.batchTableView.setMRMLTableNode(self.batchTableSelector.currentNode())
-        self.validate()
-
-    # ------------------------------------------------------------------------------
-    def onChangeImageColumn(self):
-        """Execute on change to Image Filename"""
+        tableNode = self.batchTableSelector.currentNode()
+        if self.batchTableView is None and tableNode is not None:
+            self.batchTableView = slicer.qMRMLTableView()
+            self.CsvInputGroupBox.layout().replaceWidget(
+                self._tableViewPlaceholder, self.batchTableView
+            )
+            self._tableViewPlaceholder.deleteLater()
+            self._tableViewPlaceholder = None
+            self.batchTableView.show()
+        if self.batchTableView is not None:
+            self.batchTableView.setMRMLTableNode(tableNode)
         self.validate()
 
     # ------------------------------------------------------------------------------
@@ -270,27 +341,43 @@ class CaseTableIteratorWidget(IteratorBase.IteratorWidgetBase):
         """
         columnMap = {}
 
-        if self.rootSelector.text != "":
-            columnMap["root"] = str(self.rootSelector.text).strip()
+        root = self._getParameter("rootSelector")
+        if root != "":
+            columnMap["root"] = str(root).strip()
 
-        assert self.imageSelector.text != ""  # Image column is a required column
-        columnMap["image"] = str(self.imageSelector.text).strip()
+        image = self._getParameter("imageSelector")
+        assert image != ""  # Image column is a required column
+        columnMap["image"] = str(image).strip()
 
-        if self.maskSelector.text != "":
-            columnMap["mask"] = str(self.maskSelector.text).strip()
+        mask = self._getParameter("maskSelector")
+        if mask != "":
+            columnMap["mask"] = str(mask).strip()
 
-        if self.addImsSelector.text != "":
-            columnMap["additionalImages"] = [
-                str(c).strip() for c in self.addImsSelector.text.split(",")
-            ]
+        additionalImages = self._getParameter("addImsSelector")
+        if additionalImages != "":
+            columnMap["additionalImages"] = self._splitCols(additionalImages)
 
-        if self.addMasksSelector.text != "":
-            columnMap["additionalMasks"] = [
-                str(c).strip() for c in self.addMasksSelector.text.split(",")
-            ]
+        additionalMasks = self._getParameter("addMasksSelector")
+        if additionalMasks != "":
+            columnMap["additionalMasks"] = self._splitCols(additionalMasks)
 
         return columnMap
 
+    # ------------------------------------------------------------------------------
+    @staticmethod
+    def _splitCols(text):
+        """Split a comma separated list of column names.
+
+        Empty and duplicate column names are removed, preserving the order.
+
+        Args:
+            text (str): Comma separated column names.
+
+        Returns:
+            list: Unique, stripped column names.
+        """
+        return list(dict.fromkeys(c.strip() for c in str(text).split(",") if c.strip()))
+
 
 # ------------------------------------------------------------------------------
 # SlicerCaseIterator CSV iterator
@@ -311,6 +398,7 @@ class CaseTableIteratorLogic(IteratorBase.IteratorLogicBase):
             self.csv_dir = os.path.dirname(tableStorageNode.GetFileName())
         else:  # Table did not originate from a file
             self.csv_dir = None
+        self._csv_dir_abs = os.path.abspath(self.csv_dir) if self.csv_dir else None
 
         # Get the actual table contained in the MRML node
         self.batchTable = tableNode.GetTable()
@@ -322,6 +410,14 @@ class CaseTableIteratorLogic(IteratorBase.IteratorLogicBase):
             self.batchTable.GetNumberOfRows()
         )  # Counter equalling the total number of cases
 
+        # Node IDs of the currently loaded case, also stored in the parameter node
+        self._caseData = None
+
+        # If True, the files of a case are read in background threads while the main
+        # image is loading, and those of the next case once it is loaded, so that they
+        # are loaded from the OS page cache
+        self.parallelPrefetch = True
+
     # ------------------------------------------------------------------------------
     def __del__(self):
         super(CaseTableIteratorLogic, self).__del__()
@@ -333,16 +429,31 @@ class CaseTableIteratorLogic(IteratorBase.IteratorLogicBase):
     def _getColumns(self, columnMap):
         """Retrieve validated columns from the columnMap that exist in the loaded table.
 
-        Errors are created if they are not found in the loaded table.
+        Errors are created if they are not found in the loaded table. The values of
+        the columns are copied into lists of strings, so that loading a case does not
+        need to access the VTK table.
 
         Args:
             columnMap (dict): Dictionary of the table columns used.
 
         Returns:
-            dict: A validated key/value set of columns that exist in the table.
+            dict: A validated key/value set of column values for columns that exist
+                  in the table.
         """
         caseColumns = {}
 
+        def getValues(col):
+            """Get all values of a table column.
+
+            Args:
+                col (vtkAbstractArray): Column of the batchTable.
+
+            Returns:
+                list: The values of the column, one per case.
+            """
+            getValue = col.GetValue
+            return [getValue(idx) for idx in range(col.GetNumberOfValues())]
+
         # Declare temporary function to parse out the user config and get the correct
         # columns from the batchTable
         def getColumn(key):
@@ -360,6 +471,7 @@ class CaseTableIteratorLogic(IteratorBase.IteratorLogicBase):
                     columnMap[key],
                     key,
                 )
+                col = getValues(col)
             caseColumns[key] = col
 
         def getListColumn(key):
@@ -376,7 +488,7 @@ class CaseTableIteratorLogic(IteratorBase.IteratorLogicBase):
                         c_key,
                         key,
                     )
-                    col_list.append(col)
+                    col_list.append(getValues(col))
             caseColumns[key] = col_list
 
         # Special case: Check if there is a column "patient" or "ID"
@@ -385,7 +497,7 @@ class CaseTableIteratorLogic(IteratorBase.IteratorLogicBase):
         if patientColumn is None:
             patientColumn = self.batchTable.GetColumnByName("ID")
         if patientColumn is not None:
-            caseColumns["patient"] = patientColumn
+            caseColumns["patient"] = getValues(patientColumn)
 
         # Get the other configurable columns
         getColumn("root")
@@ -410,99 +522,139 @@ class CaseTableIteratorLogic(IteratorBase.IteratorLogicBase):
             0 <= case_idx < self.caseCount
         ), "case_idx %d is out of range (n cases: %d)" % (case_idx, self.caseCount)
 
+        # Reads of a prefetched case are kept only if that case is being loaded
+        self._cancelPrefetch(case_idx)
+
         if self.currentIdx is not None:
             self.closeCase()
 
         if "patient" in self.caseColumns:
-            patient = self.caseColumns["patient"].GetValue(case_idx)
+            patient = self.caseColumns["patient"][case_idx]
             self.logger.info(
                 "Loading patient (%d/%d): %s...", case_idx + 1, self.caseCount, patient
             )
         else:
             self.logger.info("Loading patient (%d/%d)...", case_idx + 1, self.caseCount)
 
-        root = self._getColumnValue("root", case_idx)
+        resolve, im, additionalImages, mask, additionalMasks = self._getCaseFiles(
+            case_idx
+        )
+
+        # The files of a case that was prefetched are being read already
+        if self.parallelPrefetch and self._prefetchIdx != case_idx:
+            self._prefetchPaths(
+                map(resolve, additionalImages + [mask] + additionalMasks), case_idx
+            )
 
         # Load images
-        im = self._getColumnValue("image", case_idx)
-        im_node = self._loadImageNode(root, im)
+        im_node = self._loadImageNode(resolve, im)
         assert im_node is not None, "Failed to load main image"
 
         additionalImageNodes = []
-        for im in self._getColumnValue("additionalImages", case_idx, True):
-            add_im_node = self._loadImageNode(root, im)
+        for im in additionalImages:
+            add_im_node = self._loadImageNode(resolve, im)
             if add_im_node is not None:
                 additionalImageNodes.append(add_im_node)
 
         # Load masks
-        ma = self._getColumnValue("mask", case_idx)
-        if ma is not None:
-            ma_node = self._loadMaskNode(root, ma, im_node)
+        if mask is not None:
+            ma_node = self._loadMaskNode(resolve, mask, im_node)
         else:
             ma_node = None
 
         additionalMaskNodes = []
-        for ma in self._getColumnValue("additionalMasks", case_idx, True):
-            add_ma_node = self._loadMaskNode(root, ma)
+        for ma in additionalMasks:
+            add_ma_node = self._loadMaskNode(resolve, ma)
             if add_ma_node is not None:
                 additionalMaskNodes.append(add_ma_node)
 
-        self.parameterNode.SetParameter(
-            "CaseData",
-            {
-                "InputImage_ID": im_node.GetID(),
-                "InputMask_ID": ma_node.GetID(),
-                "Additional_InputImage_IDs": [
-                    node.GetID() for node in additionalImageNodes
-                ],
-                "Additional_InputMask_IDs": [
-                    node.GetID() for node in additionalMaskNodes
-                ],
-            }.__str__(),
-        )
+        self._caseData = {
+            "InputImage_ID": im_node.GetID(),
+            "InputMask_ID": ma_node.GetID() if ma_node is not None else None,
+            "Additional_InputImage_IDs": [
+                node.GetID() for node in additionalImageNodes
+            ],
+            "Additional_InputMask_IDs": [node.GetID() for node in additionalMaskNodes],
+        }
+        self.parameterNode.SetParameter("CaseData", json.dumps(self._caseData))
 
         self.currentIdx = case_idx
 
+        if self.parallelPrefetch and case_idx + 1 < self.caseCount:
+            self.prefetchCase(case_idx + 1)
+
         self._eventListeners.caseLoaded(self.parameterNode)
         return True
 
+    def prefetchCase(self, case_idx):
+        """Read the files of a case in the background, so it loads faster later on.
+
+        Args:
+            case_idx (int): The index of the case in the table.
+        """
+        resolve, im, additionalImages, mask, additionalMasks = self._getCaseFiles(
+            case_idx
+        )
+        fnames = [im] + additionalImages + [mask] + additionalMasks
+        self._prefetchPaths(map(resolve, fnames), case_idx)
+
+    def _getCaseFiles(self, case_idx):
+        """Get the path resolver and the file names of a case from the table.
+
+        Args:
+            case_idx (int): The index of the case in the table.
+
+        Returns:
+            tuple: path resolver (see `_makeResolver`), image, list of additional
+                   images, mask and list of additional masks
+        """
+        return (
+            self._makeResolver(self._getColumnValue("root", case_idx)),
+            self._getColumnValue("image", case_idx),
+            self._getColumnValue("additionalImages", case_idx, True),
+            self._getColumnValue("mask", case_idx),
+            self._getColumnValue("additionalMasks", case_idx, True),
+        )
+
     def closeCase(self):
         """Close a case by removing the nodes and reseting values."""
         self._eventListeners.caseAboutToClose(self.parameterNode)
-        if self.parameterNode.GetParameter("CaseData"):
-            caseData = ast.literal_eval(self.parameterNode.GetParameter("CaseData"))
-
-            self.removeNodeByID(caseData["InputImage_ID"])
-            if caseData["InputMask_ID"]:
-                self.removeNodeByID(caseData["InputMask_ID"])
-
-            deque(map(self.removeNodeByID, caseData["Additional_InputImage_IDs"]))
-            deque(map(self.removeNodeByID, caseData["Additional_InputMask_IDs"]))
+        caseData = self._caseData
+        if caseData is not None:
+            self.removeNodesByIDs(
+                [caseData["InputImage_ID"], caseData["InputMask_ID"]]
+                + caseData["Additional_InputImage_IDs"]
+                + caseData["Additional_InputMask_IDs"]
+            )
+            self.parameterNode.UnsetParameter("CaseData")
+        self._caseData = None
         self.currentIdx = None
 
     def getCaseData(self):
-        """Retrieve node from NodeIDs stored in the CaseData of the parameterNode.
+        """Retrieve node from NodeIDs of the current case.
 
-        Each node is returned, None, or an empty list.
+        The NodeIDs are taken from the cached CaseData, falling back to the CaseData
+        stored in the parameterNode. Each node is returned, None, or an empty list.
 
         Returns:
             tuple:  image node, mask node, additional image nodes, additional mask nodes
         """
 
         try:
-            caseData = eval(self.parameterNode.GetParameter("CaseData"))
-            im = slicer.mrmlScene.GetNodeByID(caseData["InputImage_ID"])
+            caseData = self._caseData
+            if caseData is None:
+                caseData = self.parseCaseData(
+                    self.parameterNode.GetParameter("CaseData")
+                )
+            getNodeByID = slicer.mrmlScene.GetNodeByID
+            im = getNodeByID(caseData["InputImage_ID"])
             ma = (
-                slicer.mrmlScene.GetNodeByID(caseData["InputMask_ID"])
+                getNodeByID(caseData["InputMask_ID"])
                 if caseData["InputMask_ID"]
                 else None
             )
-            add_im = list(
-                map(slicer.mrmlScene.GetNodeByID, caseData["Additional_InputImage_IDs"])
-            )
-            add_ma = list(
-                map(slicer.mrmlScene.GetNodeByID, caseData["Additional_InputMask_IDs"])
-            )
+            add_im = [getNodeByID(i) for i in caseData["Additional_InputImage_IDs"]]
+            add_ma = [getNodeByID(i) for i in caseData["Additional_InputMask_IDs"]]
             return im, ma, add_im, add_ma
         except Exception:
             return [None, None, [], []]
@@ -525,53 +677,56 @@ class CaseTableIteratorLogic(IteratorBase.IteratorLogicBase):
             else:
                 return None
         if is_list:
-            return [col.GetValue(idx) for col in self.caseColumns[colName]]
+            return [col[idx] for col in self.caseColumns[colName]]
         else:
-            return self.caseColumns[colName].GetValue(idx)
+            return self.caseColumns[colName][idx]
 
     # ------------------------------------------------------------------------------
-    def _buildPath(self, caseRoot, fname):
-        """Build filepath.
+    def _makeResolver(self, caseRoot):
+        """Build a function resolving the file names of a case to file paths.
+
+        Relative file names are resolved against caseRoot, which in turn is resolved
+        against the directory of the loaded table if it is a relative path itself.
 
         Args:
-            caseRoot (str): Parent directory
-            fname (str): Name of the file to put in th caseRoot directory.
+            caseRoot (str): Parent directory of the files of this case, or None.
 
         Returns:
-            str: Fully qualified file path.
+            function: Function mapping a file name to a fully qualified file path,
+                      or to None if the file name is empty.
         """
-        if fname is None or fname == "":
-            return None
-
-        if os.path.isabs(fname):
-            return fname
+        rootIsAbs = caseRoot is not None and os.path.isabs(caseRoot)
+        if rootIsAbs:
+            baseDir = caseRoot
+        else:
+            baseDir = os.path.join(self._csv_dir_abs or "", caseRoot or "")
 
-        # Add the caseRoot if specified
-        if caseRoot is not None:
-            fname = os.path.join(caseRoot, fname)
+        isabs = os.path.isabs
+        join = os.path.join
+        abspath = os.path.abspath
 
-            # Check if the caseRoot is an absolute path
-            if os.path.isabs(fname):
+        def resolve(fname):
+            if not fname:
+                return None
+            if isabs(fname):
                 return fname
+            path = join(baseDir, fname)
+            return path if rootIsAbs else abspath(path)
 
-        # Add the csv_dir to the path if it is not None (loaded table)
-        if self.csv_dir is not None:
-            fname = os.path.join(self.csv_dir, fname)
-
-        return os.path.abspath(fname)
+        return resolve
 
     # ------------------------------------------------------------------------------
-    def _loadImageNode(self, root, fname):
-        """Load an Image Node from root/fname.
+    def _loadImageNode(self, resolve, fname):
+        """Load an Image Node from fname.
 
         Args:
-            root (str): Directory of the file.
+            resolve (function): Path resolver of the case, see `_makeResolver`.
             fname (str): Name of the file.
 
         Returns:
             Node: The 3D Slicer Node representing the loaded image.
         """
-        im_path = self._buildPath(root, fname)
+        im_path = resolve(fname)
         if im_path is None:
             return None
 
@@ -590,13 +745,13 @@ class CaseTableIteratorLogic(IteratorBase.IteratorLogicBase):
         return im_node
 
     # ------------------------------------------------------------------------------
-    def _loadMaskNode(self, root, fname, ref_im=None):
-        """Load a mask node specified at root/fname that is associated with ref_im.
+    def _loadMaskNode(self, resolve, fname, ref_im=None):
+        """Load a mask node specified by fname that is associated with ref_im.
 
         The masks are loaded as segmentations or converted from Label Maps (nifti).
 
         Args:
-            root (str): Directory where the mask is located.
+            resolve (function): Path resolver of the case, see `_makeResolver`.
             fname (str): The file name of the mask.
             ref_im (Node, optional): The node of the loaded reference image.
                                      Defaults to None.
@@ -604,7 +759,7 @@ class CaseTableIteratorLogic(IteratorBase.IteratorLogicBase):
         Returns:
             Node or None: The 3D Slicer Node of the mask or None if failed to load.
         """
-        ma_path = self._buildPath(root, fname)
+        ma_path = resolve(fname)
         if ma_path is None:
             return None
 
@@ -616,7 +771,8 @@ class CaseTableIteratorLogic(IteratorBase.IteratorLogicBase):
             return None
 
         # Determine if file is segmentation based on extension
-        isSegmentation = os.path.splitext(ma_path)[0].endswith(".seg")
+        file_base, ext = os.path.splitext(ma_path)
+        isSegmentation = file_base.endswith(".seg")
         # Try to load the mask
         if isSegmentation:
             self.logger.debug("Loading segmentation")
@@ -642,7 +798,6 @@ class CaseTableIteratorLogic(IteratorBase.IteratorLogicBase):
                 ma_node = seg_node
 
                 # Add a storage node for this segmentation node
-                file_base, ext = os.path.splitext(ma_path)
                 store_node = seg_node.CreateDefaultStorageNode()
                 slicer.mrmlScene.AddNode(store_node)
                 seg_node.SetAndObserveStorageNodeID(store_node.GetID())
@@ -657,11 +812,11 @@ class CaseTableIteratorLogic(IteratorBase.IteratorLogicBase):
             return None
 
         # Use the file basename as the name for the newly loaded segmentation node
-        file_base = os.path.splitext(os.path.basename(ma_path))[0]
+        node_name = os.path.basename(file_base)
         if isSegmentation:
             # split off .seg
-            file_base = os.path.splitext(file_base)[0]
-        ma_node.SetName(file_base)
+            node_name = node_name[: -len(".seg")]
+        ma_node.SetName(node_name)
 
         return ma_node
 
@@ -679,6 +834,27 @@ class CsvTableEventHandler(IteratorBase.IteratorEventHandlerBase):
         self.saveNew = saveNew
         self.saveLoaded = saveLoaded
 
+        # Segment editor widget, resolved on first use when redirecting
+        self._segmentEditorWidget = None
+
+        # IDs of segmentation nodes added to the scene while a case is loaded, these
+        # are the new masks to save. Nodes are tracked by observing the scene from
+        # loading until closing the case.
+        self._newSegmentationIDs = []
+        self._nodeAddedObserver = None
+
+    @vtk.calldata_type(vtk.VTK_OBJECT)
+    def _onNodeAdded(self, caller, event, node):
+        """Keep track of segmentation nodes added to the scene.
+
+        Args:
+            caller (vtkMRMLScene): The scene the node was added to.
+            event (str): The name of the event.
+            node (vtkMRMLNode): The added node.
+        """
+        if node.IsA("vtkMRMLSegmentationNode"):
+            self._newSegmentationIDs.append(node.GetID())
+
     @staticmethod
     def _rotateToVolumePlanes(referenceVolume):
         """Snap three planes to views of the reference image.
@@ -686,15 +862,15 @@ class CsvTableEventHandler(IteratorBase.IteratorEventHandlerBase):
         Args:
             referenceVolume (Node): The reference image to view in the panes.
         """
-        sliceNodes = slicer.util.getNodes("vtkMRMLSliceNode*")
-        for name, node in sliceNodes.items():
-            node.RotateToVolumePlane(referenceVolume)
+        scene = slicer.mrmlScene
+        getNthNode = scene.GetNthNodeByClass
+        for idx in range(scene.GetNumberOfNodesByClass("vtkMRMLSliceNode")):
+            getNthNode(idx, "vtkMRMLSliceNode").RotateToVolumePlane(referenceVolume)
         # Snap to IJK to try and avoid rounding errors
         sliceLogics = slicer.app.layoutManager().mrmlSliceLogics()
-        numLogics = sliceLogics.GetNumberOfItems()
-        for n in range(numLogics):
-            l = sliceLogics.GetItemAsObject(n)
-            l.SnapSliceOffsetToIJK()
+        getItem = sliceLogics.GetItemAsObject
+        for n in range(sliceLogics.GetNumberOfItems()):
+            getItem(n).SnapSliceOffsetToIJK()
 
     def onCaseLoaded(self, caller, *args, **kwargs):
         """Tasks performed on loading a case.
@@ -702,20 +878,28 @@ class CsvTableEventHandler(IteratorBase.IteratorEventHandlerBase):
         Args:
             caller (Iterator): The iterator class loading the case.
         """
+        if self.saveNew and self._nodeAddedObserver is None:
+            self._newSegmentationIDs = []
+            self._nodeAddedObserver = slicer.mrmlScene.AddObserver(
+                slicer.vtkMRMLScene.NodeAddedEvent, self._onNodeAdded
+            )
+
         try:
             im, ma, add_im, add_ma = caller.getCaseData()
 
             # Set the slice viewers to the correct volumes
-            for sliceWidgetName in ["Red", "Green", "Yellow"]:
+            layoutManager = slicer.app.layoutManager()
+            imID = im.GetID()
+            fgID = add_im[0].GetID() if len(add_im) > 0 else None
+            for sliceWidgetName in ("Red", "Green", "Yellow"):
                 logic = (
-                    slicer.app.layoutManager()
-                    .sliceWidget(sliceWidgetName)
+                    layoutManager.sliceWidget(sliceWidgetName)
                     .sliceLogic()
                     .GetSliceCompositeNode()
                 )
-                logic.SetBackgroundVolumeID(im.GetID())
-                if len(add_im) > 0:
-                    logic.SetForegroundVolumeID(add_im[0].GetID())
+                logic.SetBackgroundVolumeID(imID)
+                if fgID is not None:
+                    logic.SetForegroundVolumeID(fgID)
 
             # Snap the viewers to the slice plane of the main image
             self._rotateToVolumePlanes(im)
@@ -729,12 +913,15 @@ class CsvTableEventHandler(IteratorBase.IteratorEventHandlerBase):
                     slicer.modules.SegmentEditorWidget.enter()
 
                 # Explicitly set the segmentation and master volume nodes
-                segmentEditorWidget = (
-                    slicer.modules.segmenteditor.widgetRepresentation().self().editor
-                )
+                if self._segmentEditorWidget is None:
+                    self._segmentEditorWidget = (
+                        slicer.modules.segmenteditor.widgetRepresentation()
+                        .self()
+                        .editor
+                    )
                 if ma is not None:
-                    segmentEditorWidget.setSegmentationNode(ma)
-                segmentEditorWidget.setSourceVolumeNode(im)
+                    self._segmentEditorWidget.setSegmentationNode(ma)
+                self._segmentEditorWidget.setSourceVolumeNode(im)
 
         except Exception as e:
             if slicer.app.majorVersion * 100 + slicer.app.minorVersion < 411:
@@ -745,12 +932,30 @@ class CsvTableEventHandler(IteratorBase.IteratorEventHandlerBase):
     def onCaseAboutToClose(self, caller, *args, **kwargs):
         """Perform tasks before a case is closed.
 
-        Save masks to Flywheel instance.
+        Save the loaded and/or new masks, depending on the settings of this handler.
 
         Args:
             caller (Iterator): The iterator parsing through the table.
         """
-        caseData = caller.getCaseData()
+        if self._nodeAddedObserver is not None:
+            slicer.mrmlScene.RemoveObserver(self._nodeAddedObserver)
+            self._nodeAddedObserver = None
+
+        if self.saveLoaded or self.saveNew:
+            self._saveCaseMasks(caller.getCaseData())
+        self._newSegmentationIDs = []
+
+        if slicer.util.selectedModule() == "SegmentEditor":
+            slicer.modules.SegmentEditorWidget.exit()
+
+    # ------------------------------------------------------------------------------
+    def _saveCaseMasks(self, caseData):
+        """Save the loaded and/or new masks of a case.
+
+        Args:
+            caseData (tuple): image node, mask node, additional image nodes,
+                              additional mask nodes of the case.
+        """
         _, mask, _, additionalMasks = caseData
         if self.saveLoaded:
             if mask is not None:
@@ -760,29 +965,35 @@ class CsvTableEventHandler(IteratorBase.IteratorEventHandlerBase):
         if self.saveNew:
             # TODO: this should depend on if more segments were added in segmentation
             # node not depending on a new
-            nodes = [
-                n
-                for n in slicer.util.getNodesByClass("vtkMRMLSegmentationNode")
-                if n not in additionalMasks and n != mask
-            ]
-
-            deque(map(lambda n: self.saveMask(n, self.reader, caseData), nodes))
+            loadedIDs = {ma.GetID() for ma in additionalMasks if ma is not None}
+            if mask is not None:
+                loadedIDs.add(mask.GetID())
 
-        if slicer.util.selectedModule() == "SegmentEditor":
-            slicer.modules.SegmentEditorWidget.exit()
+            for nodeID in self._newSegmentationIDs:
+                if nodeID in loadedIDs:
+                    continue
+                # Skip segmentations that were removed again during the case
+                n = slicer.mrmlScene.GetNodeByID(nodeID)
+                if n is not None:
+                    self.saveMask(n, self.reader, caseData)
 
     # ------------------------------------------------------------------------------
     def saveMask(self, node, reader, caseData, overwrite_existing=False):
         """Save mask to filesystem.
 
-        This function is not used in this module. It can safely be deleted.
+        Loaded masks are saved next to the original file, new masks next to the main
+        image of the case.
 
         Args:
             node (Node): Node of mask to save.
             reader (str): Name of the reader or None.
-            caseData (dict): Dictionary of the NodeIDs used in this case.
+            caseData (tuple): image node, mask node, additional image nodes,
+                              additional mask nodes of the case.
             overwrite_existing (bool, optional): Overwrite existing masks.
                                                  Defaults to False.
+
+        Returns:
+            boolean: True if the mask was saved successfully.
         """
         storage_node = node.GetStorageNode()
         if storage_node is not None and storage_node.GetFileName() is not None:
@@ -805,14 +1016,21 @@ class CsvTableEventHandler(IteratorBase.IteratorEventHandlerBase):
         # Prevent overwriting existing files
         if os.path.exists(filename + ".seg.nrrd") and not overwrite_existing:
             self.logger.debug("Filename exists! Generating unique name...")
-            idx = 1
-            filename += "(%d).seg.nrrd"
-            while os.path.exists(filename % idx):
-                idx += 1
-            filename = filename % idx
+            # Scan the directory once and use the next index after the highest one
+            pattern = re.compile(re.escape(nodename) + r"\((\d+)\)\.seg\.nrrd$")
+            indices = []
+            with os.scandir(target_dir) as entries:
+                for entry in entries:
+                    match = pattern.match(entry.name)
+                    if match is not None:
+                        indices.append(int(match.group(1)))
+            filename += "(%d).seg.nrrd" % (max(indices, default=0) + 1)
         else:
             filename += ".seg.nrrd"
 
         # Save the node
-        slicer.util.saveNode(node, filename)
+        if not slicer.util.saveNode(node, filename):
+            self.logger.warning("Failed to save node %s in %s", nodename, filename)
+            return False
         self.logger.info("Saved node %s in %s", nodename, filename)
+        return True
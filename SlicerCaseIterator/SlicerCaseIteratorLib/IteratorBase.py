@@ -13,7 +13,47 @@
 
 import slicer
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import json
 import logging
+import threading
+import weakref
+
+_WIDGET_LOGGER = logging.getLogger("SlicerCaseIterator.IteratorWidget")
+_LOGIC_LOGGER = logging.getLogger("SlicerCaseIterator.Iterator")
+
+
+@functools.lru_cache(maxsize=None)
+def _logger_for(cls):
+    """Get the logger for an event handler class, named after the class.
+
+    Args:
+        cls (type): The event handler class.
+
+    Returns:
+        logging.Logger: The logger of the class.
+    """
+    return logging.getLogger(cls.__name__)
+
+
+def _readFile(path, stopEvent=None, chunkSize=1 << 20):
+    """Read a file and discard its contents, ignoring files that cannot be read.
+
+    Args:
+        path (str): Path of the file to read.
+        stopEvent (threading.Event, optional): If set, reading stops after the current
+                                               chunk. Defaults to None.
+        chunkSize (int, optional): Number of bytes to read at once. Defaults to 1 MB.
+    """
+    try:
+        with open(path, "rb") as f:
+            while f.read(chunkSize):
+                if stopEvent is not None and stopEvent.is_set():
+                    break
+    except OSError:
+        pass
+
 
 # ------------------------------------------------------------------------------
 # IteratorWidgetBase
@@ -36,7 +76,7 @@ class IteratorWidgetBase(object):
     """
 
     def __init__(self):
-        self.logger = logging.getLogger("SlicerCaseIterator.IteratorWidget")
+        self.logger = _WIDGET_LOGGER
         self.validationHandler = None
         self._iterator = None
 
@@ -110,21 +150,62 @@ class IteratorWidgetBase(object):
 
 
 class IteratorEventListenerList(list):
-    """Class to manage case iteration."""
+    """Class to manage case iteration.
+
+    Each listener is contained only once, appending a listener that is already in the
+    list has no effect. The iterator is referenced weakly, so the iterator and its
+    listener list do not form a reference cycle.
+    """
 
     def __init__(self, iterator):
         super(IteratorEventListenerList, self).__init__()
-        self._iterator = iterator
+        self._iteratorRef = weakref.ref(iterator)
 
-    def caseLoaded(self, *args, **kwargs):
-        """Perform when a case is loaded."""
-        for eventListener in self:
-            eventListener.onCaseLoaded(self._iterator, *args, **kwargs)
+    def append(self, listener):
+        """Add a listener, unless it is already in the list.
 
-    def caseAboutToClose(self, *args, **kwargs):
-        """Perform before a case is closed."""
-        for eventListener in self:
-            eventListener.onCaseAboutToClose(self._iterator, *args, **kwargs)
+        Args:
+            listener (IteratorEventHandlerBase): The listener to add.
+        """
+        if listener not in self:
+            super(IteratorEventListenerList, self).append(listener)
+
+    def caseLoaded(self, parameterNode, *args, **kwargs):
+        """Perform when a case is loaded.
+
+        Args:
+            parameterNode (vtkMRMLScriptedModuleNode): Parameter node of the iterator.
+        """
+        iterator = self._iteratorRef()
+        if iterator is None:
+            _LOGIC_LOGGER.warning(
+                "Iterator was garbage collected, not dispatching caseLoaded to %d "
+                "listener(s)",
+                len(self),
+            )
+            return
+        for eventListener in self[:]:
+            eventListener.onCaseLoaded(iterator, parameterNode, *args, **kwargs)
+
+    def caseAboutToClose(self, parameterNode, *args, **kwargs):
+        """Perform before a case is closed.
+
+        Args:
+            parameterNode (vtkMRMLScriptedModuleNode): Parameter node of the iterator.
+        """
+        iterator = self._iteratorRef()
+        if iterator is None:
+            # Happens when the cyclic garbage collector clears the weak reference
+            # before the iterator's __del__ closes its case. Listeners then do not get
+            # to save masks or leave the Segment Editor.
+            _LOGIC_LOGGER.warning(
+                "Iterator was garbage collected, not dispatching caseAboutToClose to "
+                "%d listener(s)",
+                len(self),
+            )
+            return
+        for eventListener in self[:]:
+            eventListener.onCaseAboutToClose(iterator, parameterNode, *args, **kwargs)
 
 
 # ------------------------------------------------------------------------------
@@ -150,14 +231,19 @@ class IteratorLogicBase(object):
     def parameterNode(self):
         """A node to store relevant iterator and case parameters within.
 
-        If a parameter node does not exist, it is created.
+        If a parameter node does not exist, it is created. The node is cached for as
+        long as it is part of the scene.
 
         Returns:
             vtkMRMLScriptedModuleNode: The retrieved or created parameter node.
         """
+        node = self._parameterNode
+        if node is not None and node.GetScene() is not None:
+            return node
         node = self._findParameterNodeInScene()
         if not node:
             node = self._createParameterNode()
+        self._parameterNode = node
         return node
 
     @staticmethod
@@ -173,34 +259,88 @@ class IteratorLogicBase(object):
         if node:
             mrmlScene.RemoveNode(node)
 
+    @staticmethod
+    def removeNodesByIDs(nodeIDs, mrmlScene=slicer.mrmlScene):
+        """Remove multiple nodes from Slicer Scene by Node ID.
+
+        The nodes are removed in batch processing state, so scene observers are
+        notified once instead of after every removed node.
+
+        Args:
+            nodeIDs (iterable of str): IDs of the Nodes to delete. Empty IDs are skipped.
+            mrmlScene (vtkMRMLScene, optional): Slicer Scene.
+                                                Defaults to slicer.mrmlScene.
+        """
+        mrmlScene.StartState(slicer.vtkMRMLScene.BatchProcessState)
+        try:
+            for nodeID in nodeIDs:
+                if not nodeID:
+                    continue
+                node = mrmlScene.GetNodeByID(nodeID)
+                if node:
+                    mrmlScene.RemoveNode(node)
+        finally:
+            mrmlScene.EndState(slicer.vtkMRMLScene.BatchProcessState)
+
+    @staticmethod
+    def parseCaseData(caseData):
+        """Parse case data stored as a string in the parameter node.
+
+        Case data is stored as JSON, but the Python literal format written by earlier
+        versions is still accepted.
+
+        Args:
+            caseData (str): The stored case data.
+
+        Returns:
+            dict: The parsed case data.
+        """
+        try:
+            return json.loads(caseData)
+        except ValueError:
+            import ast
+
+            return ast.literal_eval(caseData)
+
     def __init__(self):
-        self.logger = logging.getLogger("SlicerCaseIterator.Iterator")
+        self.logger = _LOGIC_LOGGER
         self.currentIdx = None
         self.caseCount = None
+        self._parameterNode = None
         self._eventListeners = IteratorEventListenerList(self)
+        self._ioExecutor = None
+        self._prefetchFutures = []
+        self._prefetchIdx = None
+        # Set to stop the reads that are running, replaced on every cancellation
+        self._prefetchStop = threading.Event()
 
     def __del__(self):
         self.logger.debug("Destroying Case Iterator Logic instance")
         if self.currentIdx is not None:
-            self.closeCase()
+            try:
+                self.closeCase()
+            except Exception:
+                self.logger.exception("Failed to close case on destruction")
         self._eventListeners = []
-        slicer.mrmlScene.RemoveNode(self.parameterNode)
+        self.shutdownIO()
+        # Use the cached node; the parameterNode property would search the scene and
+        # could create a new node during teardown.
+        node = self._parameterNode
+        if node is not None and node.GetScene():
+            slicer.mrmlScene.RemoveNode(node)
 
     def _findParameterNodeInScene(self):
         """Find and return the parameter node.
 
-        If the parameter node is not found, return None.
+        The parameter node is looked up by its singleton tag. If the parameter node is
+        not found, return None.
 
         Returns:
             vtkMRMLScriptedModuleNode or None: The parameter node or None.
         """
-        for i in range(
-            slicer.mrmlScene.GetNumberOfNodesByClass("vtkMRMLScriptedModuleNode")
-        ):
-            n = slicer.mrmlScene.GetNthNodeByClass(i, "vtkMRMLScriptedModuleNode")
-            if n.GetModuleName() == "SlicerCaseIterator":
-                return n
-        return None
+        return slicer.mrmlScene.GetSingletonNode(
+            "SlicerCaseIterator", "vtkMRMLScriptedModuleNode"
+        )
 
     def _createParameterNode(self):
         """Create a parameter node for the batch.
@@ -223,9 +363,7 @@ class IteratorLogicBase(object):
         Args:
             listener (IteratorEventHandlerBase): Subclass of IteratorEventHandlerBase
         """
-
-        if listener not in self._eventListeners:
-            self._eventListeners.append(listener)
+        self._eventListeners.append(listener)
 
     @abstractmethod
     def loadCase(self, case_idx):
@@ -242,10 +380,86 @@ class IteratorLogicBase(object):
                    list of additional images, list of additional masks)
         """
 
+    def prefetchCase(self, case_idx):
+        """Function called to start reading a case in the background.
+
+        Implementations can override this to get the files of the case that is likely
+        to be loaded next into the OS page cache, e.g. by passing them to
+        _prefetchPaths. It should be called from loadCase after the files of the
+        current case have been read, so prefetching does not compete with loading.
+
+        Args:
+            case_idx (int): index of the case to prefetch,
+                            0 <= case_idx < self.caseCount
+        """
+        pass
+
     @abstractmethod
     def closeCase(self):
         """Function called by the logic to close currently opened case."""
 
+    def shutdownIO(self):
+        """Stop the background reads and shut down the IO thread pool.
+
+        Call this when a batch is cleaned up or the application is closed. Running
+        reads would otherwise keep the worker threads, and with them the application,
+        alive until their files have been read completely.
+        """
+        self._cancelPrefetch()
+        if self._ioExecutor is not None:
+            self._ioExecutor.shutdown(wait=False, cancel_futures=True)
+            self._ioExecutor = None
+
+    def _getIOExecutor(self):
+        """Get the thread pool used for file system access, creating it if needed.
+
+        Returns:
+            ThreadPoolExecutor: The thread pool.
+        """
+        if self._ioExecutor is None:
+            self._ioExecutor = ThreadPoolExecutor(
+                max_workers=4, thread_name_prefix="SlicerCaseIteratorIO"
+            )
+        return self._ioExecutor
+
+    def _prefetchPaths(self, paths, case_idx=None):
+        """Read files in background threads to get them into the OS page cache.
+
+        Slicer nodes can only be created on the main thread, so the files are not
+        parsed here. Loading them afterwards is faster as no disk access is needed.
+
+        Args:
+            paths (iterable): File paths to read, None values are skipped.
+            case_idx (int, optional): index of the case the files belong to.
+        """
+        executor = self._getIOExecutor()
+        stopEvent = self._prefetchStop
+        futures = [future for future in self._prefetchFutures if not future.done()]
+        for path in paths:
+            if path:
+                futures.append(executor.submit(_readFile, path, stopEvent))
+        self._prefetchFutures = futures
+        self._prefetchIdx = case_idx
+
+    def _cancelPrefetch(self, case_idx=None):
+        """Cancel the reads started by _prefetchPaths.
+
+        Pending reads are not started, reads that are running stop after the current
+        chunk.
+
+        Args:
+            case_idx (int, optional): index of the case about to be loaded. If this is
+                                      the case being prefetched, nothing is cancelled.
+        """
+        if case_idx is not None and case_idx == self._prefetchIdx:
+            return
+        self._prefetchStop.set()
+        self._prefetchStop = threading.Event()
+        for future in self._prefetchFutures:
+            future.cancel()
+        self._prefetchFutures = []
+        self._prefetchIdx = None
+
     @abstractmethod
     def getCaseData(self):
         """
@@ -265,7 +479,7 @@ class IteratorEventHandlerBase(object):
     IteratorLogicBase implementations"""
 
     def __init__(self):
-        self.logger = logging.getLogger(self.__class__.__name__)
+        self.logger = _logger_for(self.__class__)
 
     @abstractmethod
     def onCaseLoaded(self, caller, *args, **kwargs):
@@ -1,8 +1,9 @@
-from . import CsvTableIterator
-from . import CsvInferenceIterator
 from . import IteratorBase
 from functools import wraps
+import importlib
+import importlib.util
 import logging
+import sys
 
 
 def onExceptionReturnNone(func):
@@ -20,11 +21,16 @@ def onExceptionReturnNone(func):
 class IteratorFactory(object):
     """Class to create iterator widgets."""
 
+    # Built-in implementations are given as (module name, class name) and imported on
+    # first use, the resolved class then replaces the entry
     IMPLEMENTATIONS = {
-        "simple_csv_iteration": CsvTableIterator.CaseTableIteratorWidget,
-        "mask_comparison": CsvInferenceIterator.CsvInferenceIteratorWidget,
+        "simple_csv_iteration": (".CsvTableIterator", "CaseTableIteratorWidget"),
+        "mask_comparison": (".CsvInferenceIterator", "CsvInferenceIteratorWidget"),
     }
 
+    # Modules of the built-in implementations, relative to this package
+    _IMPL_MODULES = (".CsvTableIterator", ".CsvInferenceIterator")
+
     @classmethod
     def registerIteratorWidget(cls, name, widget):
         """Register a new instatiated widget under IMPLEMENTATIONS.
@@ -35,38 +41,35 @@ class IteratorFactory(object):
             name (str): Key of IMPLEMENTATIONS.
             widget (IteratorBase.IteratorWidgetBase): Subclass of the IteratorWidgetBase.
         """
-        if name in cls.IMPLEMENTATIONS.keys():
-            logging.warning(f"Iterator {name} is already registered")
+        # Cheap membership check first
+        if name in cls.IMPLEMENTATIONS:
+            logging.warning("Iterator %s is already registered", name)
             return
         if not issubclass(widget, IteratorBase.IteratorWidgetBase):
             logging.warning(
-                f"Widget {widget} is no subclass of IteratorBase.IteratorWidgetBase"
+                "Widget %s is no subclass of IteratorBase.IteratorWidgetBase", widget
             )
             return
         cls.IMPLEMENTATIONS[name] = widget
 
     @staticmethod
     def reloadSourceFiles():
-        """Reload all required modules."""
-        packageName = "SlicerCaseIteratorLib"
-        submoduleNames = [
-            "IteratorBase",
-            "CsvTableIterator",
-            "CsvInferenceIterator",
-            "IteratorFactory",
-        ]
-        import imp
-
-        f, filename, description = imp.find_module(packageName)
-        package = imp.load_module(packageName, f, filename, description)
-        for submoduleName in submoduleNames:
-            f, filename, description = imp.find_module(submoduleName, package.__path__)
-            try:
-                imp.load_module(
-                    packageName + "." + submoduleName, f, filename, description
-                )
-            finally:
-                f.close()
+        """Reload all required modules.
+
+        Iterator modules that have not been imported yet are skipped, they are loaded
+        from source on first use anyway.
+        """
+        from . import IteratorFactory as factoryModule
+
+        # IteratorBase is reloaded first, as the iterator modules depend on it
+        modules = [IteratorBase]
+        for modname in IteratorFactory._IMPL_MODULES:
+            module = sys.modules.get(importlib.util.resolve_name(modname, __package__))
+            if module is not None:
+                modules.append(module)
+        modules.append(factoryModule)
+        for module in modules:
+            importlib.reload(module)
 
     @staticmethod
     def getImplementationNames():
@@ -75,10 +78,9 @@ class IteratorFactory(object):
         Returns:
             list: List of valid implementations.
         """
-        return list(IteratorFactory.IMPLEMENTATIONS.keys())
+        return list(IteratorFactory.IMPLEMENTATIONS)
 
     @staticmethod
-    @onExceptionReturnNone
     def getIteratorWidget(mode):
         """Get the Iterator Widget specified by "mode".
 
@@ -86,6 +88,15 @@ class IteratorFactory(object):
             mode (str): The key of the Iterator Widget to retrieve.
 
         Returns:
-            IteratorBase.IteratorWidgetBase: Instatiated subclass of IteratorWidgetBase.
+            IteratorBase.IteratorWidgetBase: Instatiated subclass of IteratorWidgetBase,
+                                             or None if mode is not registered.
         """
-        return IteratorFactory.IMPLEMENTATIONS[mode]
+        if mode not in IteratorFactory.IMPLEMENTATIONS:
+            logging.error("Iterator %s is not registered", mode)
+            return None
+        widget = IteratorFactory.IMPLEMENTATIONS[mode]
+        if isinstance(widget, tuple):
+            modname, classname = widget
+            module = importlib.import_module(modname, __package__)
+            widget = IteratorFactory.IMPLEMENTATIONS[mode] = getattr(module, classname)
+        return widget